@@ -9,7 +9,7 @@ Les permissions sont gérées par les décorateurs `dashboard_access_required`
 et `dashboard_api_access_required`.
 """
 
-from typing import Any, cast
+from typing import IO, Any, cast
 
 from flask import (
     Blueprint,
@@ -20,6 +20,7 @@ from flask import (
     redirect,
     render_template,
     request,
+    send_file,
     session,
     url_for,
 )
@@ -176,6 +177,18 @@ def api_sauvegarder_preparation_horaire() -> tuple[Response, int]:
 
 # --- ROUTES D'EXPORT ---
 
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _xlsx_response(mem_file: IO[bytes], filename: str) -> Response:
+    """
+    Transmet un fichier Excel généré en pièce jointe.
+
+    Le fichier est envoyé par blocs puis fermé à la fin de la réponse, sans être
+    recopié en mémoire.
+    """
+    return send_file(mem_file, mimetype=XLSX_MIMETYPE, as_attachment=True, download_name=filename)
+
 
 @bp.route("/exporter_taches_excel")
 @dashboard_access_required
@@ -199,11 +212,7 @@ def exporter_taches_excel() -> Response:
         filename = f"export_taches_{annee_libelle}.xlsx"
         current_app.logger.info(f"Génération du fichier d'export '{filename}'.")
 
-        return Response(
-            mem_file,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(mem_file, filename)
     except ServiceException as e:
         flash(f"Erreur lors de la génération de l'export : {e.message}", "error")
         return redirect(url_for("dashboard.page_sommaire"))
@@ -231,11 +240,7 @@ def exporter_periodes_restantes_excel() -> Response:
         filename = f"export_periodes_restantes_{annee_libelle}.xlsx"
         current_app.logger.info(f"Génération de l'export '{filename}'.")
 
-        return Response(
-            mem_file,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(mem_file, filename)
     except ServiceException as e:
         flash(f"Erreur lors de la génération de l'export : {e.message}", "error")
         return redirect(url_for("dashboard.page_sommaire"))
@@ -263,11 +268,7 @@ def exporter_org_scolaire_excel() -> Response:
         filename = f"export_org_scolaire_{annee_libelle}.xlsx"
         current_app.logger.info(f"Génération de l'export '{filename}'.")
 
-        return Response(
-            mem_file,
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": f"attachment; filename={filename}"},
-        )
+        return _xlsx_response(mem_file, filename)
     except ServiceException as e:
         flash(f"Erreur lors de la génération de l'export : {e.message}", "error")
         return redirect(url_for("dashboard.page_sommaire"))
@@ -7,409 +7,500 @@ création de documents Excel formatés à partir de données brutes fournies
 en argument.
 """
 
-import io
+import logging
+import math
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from copy import copy
+from operator import itemgetter
+from tempfile import SpooledTemporaryFile
 from typing import Any, cast
 
 import openpyxl
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.styles.cell_style import StyleArray
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.worksheet.dimensions import ColumnDimension
+from openpyxl.xml import LXML
+
+# openpyxl ne sérialise les feuilles en écriture seule avec lxml que si celui-ci est installé ;
+# sinon, il se rabat sur ElementTree, nettement plus lent pour les gros exports.
+if not LXML:
+    logging.getLogger(__name__).warning("lxml est introuvable : les exports Excel utiliseront le sérialiseur XML plus lent d'ElementTree.")
+
+_THIN_SIDE = Side(style="thin")
+_BOX_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+
+_HEADER_FONT = Font(bold=True, color="FFFFFF", name="Calibri", size=11)
+_HEADER_FILL = PatternFill("solid", fgColor="4F81BD")
+_CELL_FONT = Font(name="Calibri", size=11)
+_SUBTOTAL_FONT = Font(bold=True, name="Calibri", size=11)
+_SUBTOTAL_FILL = PatternFill("solid", fgColor="F2F2F2")
+_GRAND_TOTAL_FONT = Font(bold=True, color="FFFFFF", name="Calibri", size=11)
+_GRAND_TOTAL_FILL = PatternFill("solid", fgColor="365F91")
+_CENTER_ALIGN = Alignment(horizontal="center", vertical="center")
+_LEFT_ALIGN = Alignment(horizontal="left", vertical="center", wrap_text=True)
+_RIGHT_ALIGN = Alignment(horizontal="right", vertical="center")
+_ORG_HEADER_FONT = Font(bold=True, name="Calibri", size=11)
+_ORG_HEADER_ALIGN = Alignment(wrap_text=True, horizontal="center", vertical="center")
+_ORG_TOTAL_FONT = Font(bold=True, name="Calibri", size=11)
+
+# Styles nommés des exports. Chaque cellule reçoit un seul style regroupant police,
+# remplissage, alignement et bordure.
+_STYLE_HEADER = "export_entete"
+_STYLE_DATA_LEFT = "export_donnee_gauche"
+_STYLE_DATA_CENTER = "export_donnee_centre"
+_STYLE_SUBTOTAL_LABEL = "export_sous_total_libelle"
+_STYLE_SUBTOTAL = "export_sous_total"
+_STYLE_SUBTOTAL_VALUE = "export_sous_total_valeur"
+_STYLE_GRAND_TOTAL_LABEL = "export_total_libelle"
+_STYLE_GRAND_TOTAL = "export_total"
+_STYLE_GRAND_TOTAL_VALUE = "export_total_valeur"
+_STYLE_ORG_HEADER = "export_org_entete"
+_STYLE_ORG_TOTAL = "export_org_total"
+
+_NAMED_STYLES: dict[str, dict[str, Any]] = {
+    _STYLE_HEADER: {"font": _HEADER_FONT, "fill": _HEADER_FILL, "alignment": _CENTER_ALIGN},
+    _STYLE_DATA_LEFT: {"font": _CELL_FONT, "alignment": _LEFT_ALIGN, "border": _BOX_BORDER},
+    _STYLE_DATA_CENTER: {"font": _CELL_FONT, "alignment": _CENTER_ALIGN, "border": _BOX_BORDER},
+    _STYLE_SUBTOTAL_LABEL: {"font": _SUBTOTAL_FONT, "fill": _SUBTOTAL_FILL, "alignment": _RIGHT_ALIGN, "border": _BOX_BORDER},
+    _STYLE_SUBTOTAL: {"font": _SUBTOTAL_FONT, "fill": _SUBTOTAL_FILL, "border": _BOX_BORDER},
+    _STYLE_SUBTOTAL_VALUE: {"font": _SUBTOTAL_FONT, "fill": _SUBTOTAL_FILL, "alignment": _CENTER_ALIGN, "border": _BOX_BORDER},
+    _STYLE_GRAND_TOTAL_LABEL: {"font": _GRAND_TOTAL_FONT, "fill": _GRAND_TOTAL_FILL, "alignment": _RIGHT_ALIGN},
+    _STYLE_GRAND_TOTAL: {"font": _GRAND_TOTAL_FONT, "fill": _GRAND_TOTAL_FILL},
+    _STYLE_GRAND_TOTAL_VALUE: {"font": _GRAND_TOTAL_FONT, "fill": _GRAND_TOTAL_FILL, "alignment": _CENTER_ALIGN},
+    _STYLE_ORG_HEADER: {"font": _ORG_HEADER_FONT, "alignment": _ORG_HEADER_ALIGN},
+    _STYLE_ORG_TOTAL: {"font": _ORG_TOTAL_FONT},
+}
+
+# Styles nommés enregistrés dans chaque type de classeur.
+_GROUPED_SHEET_STYLES = (
+    _STYLE_HEADER,
+    _STYLE_DATA_LEFT,
+    _STYLE_DATA_CENTER,
+    _STYLE_SUBTOTAL_LABEL,
+    _STYLE_SUBTOTAL,
+    _STYLE_SUBTOTAL_VALUE,
+    _STYLE_GRAND_TOTAL_LABEL,
+    _STYLE_GRAND_TOTAL,
+    _STYLE_GRAND_TOTAL_VALUE,
+)
+_ORG_SHEET_STYLES = (_STYLE_ORG_HEADER, _STYLE_ORG_TOTAL)
+
+# En-têtes des feuilles de tâches et de périodes, à partir de la colonne B.
+_TACHES_HEADERS = ("Enseignant", "Code cours", "Description", "Cours autre", "Nb. grp.", "Pér./ groupe", "Pér. Total")
+_PERIODES_HEADERS = ("Champ", "Tâche restantes", "Code cours", "Description", "Cours autre", "Pér./ groupe")
+
+# Style de chaque colonne d'une ligne de données, à partir de la colonne B.
+_TACHES_ROW_STYLES = (
+    _STYLE_DATA_LEFT,
+    _STYLE_DATA_LEFT,
+    _STYLE_DATA_LEFT,
+    _STYLE_DATA_CENTER,
+    _STYLE_DATA_CENTER,
+    _STYLE_DATA_CENTER,
+    _STYLE_DATA_CENTER,
+)
+_PERIODES_ROW_STYLES = (
+    _STYLE_DATA_LEFT,
+    _STYLE_DATA_LEFT,
+    _STYLE_DATA_LEFT,
+    _STYLE_DATA_LEFT,
+    _STYLE_DATA_CENTER,
+    _STYLE_DATA_CENTER,
+)
+
+_ORG_HEADERS = (
+    "NOM, PRÉNOM",
+    "PÉRIODES RÉGULIER",
+    "PÉRIODES ADAPTATION SCOLAIRE",
+    "PÉRIODES SPORT-ÉTUDES",
+    "PÉRIODES ENSEIGNANT RESSOURCE",
+    "PÉRIODES AIDESEC",
+    "PÉRIODES DIPLÔMA",
+    "PÉRIODES MESURE SEUIL (UTILISÉE COORDINATION PP)",
+    "PÉRIODES MESURE SEUIL (RESSOURCES AUTRES)",
+    "PÉRIODES MESURE SEUIL (POUR FABLAB)",
+    "PÉRIODES MESURE SEUIL (BONIFIER ALTERNE)",
+    "PÉRIODES ALTERNE",
+    "PÉRIODES FORMANUM",
+    "PÉRIODES MENTORAT",
+    "PÉRIODES COORDINATION SPORT-ÉTUDES",
+    "PÉRIODES SOUTIEN SPORT-ÉTUDES",
+)
+_ORG_PERIOD_HEADERS = _ORG_HEADERS[1:]
+_ORG_COLUMN_WIDTHS = tuple((get_column_letter(i), 22) for i in range(1, len(_ORG_HEADERS) + 1))
+
+# Champs lus en un seul appel pour chaque ligne de données.
+_TACHES_ROW_FIELDS = itemgetter("codecours", "coursdescriptif", "estcoursautre", "total_groupes_pris", "nbperiodes")
+_PERIODES_ROW_FIELDS = itemgetter("codecours", "coursdescriptif", "estcoursautre", "nbperiodes")
+
+# Libellé de la colonne « Cours autre », indexé par la valeur booléenne du champ.
+_OUI_NON = ("Non", "Oui")
+
+# Taille au-delà de laquelle un export est écrit sur le disque plutôt qu'en mémoire.
+_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+_TACHES_COLUMN_WIDTHS = (("A", 3), ("B", 30), ("C", 11), ("D", 43), ("E", 12), ("F", 10), ("G", 12), ("H", 12))
+_PERIODES_COLUMN_WIDTHS = (("A", 3), ("B", 35), ("C", 16), ("D", 11), ("E", 43), ("F", 12), ("G", 12))
+
+
+class _SheetTitleTable(dict[int, int | None]):
+    """
+    Table de traduction pour `str.translate` qui ne conserve que les caractères
+    alphanumériques (Unicode) ainsi que l'espace, le tiret et le souligné.
 
+    Les caractères sont classés à la première rencontre puis mis en cache, ce qui
+    évite de précalculer la table pour tout l'espace Unicode.
+    """
 
-def _apply_border_to_range(sheet: Worksheet, start_row: int, end_row: int, start_col: int, end_col: int) -> None:
-    """Applique une bordure fine autour d'une plage de cellules."""
-    thin_border_side = Side(style="thin")
-    box_border = Border(
-        left=thin_border_side,
-        right=thin_border_side,
-        top=thin_border_side,
-        bottom=thin_border_side,
-    )
+    def __missing__(self, code_point: int) -> int | None:
+        char = chr(code_point)
+        result = code_point if char.isalnum() or char in " -_" else None
+        self[code_point] = result
+        return result
 
-    for row_iter in sheet.iter_rows(min_row=start_row, max_row=end_row, min_col=start_col, max_col=end_col):
-        for cell in row_iter:
-            cell.border = box_border
 
+_SHEET_TITLE_TABLE = _SheetTitleTable()
 
-def generer_export_taches(attributions_par_champ: dict[str, dict[str, Any]]) -> io.BytesIO:
-    """
-    Génère un fichier Excel des tâches attribuées, avec une feuille par champ.
 
-    Args:
-        attributions_par_champ: Dictionnaire des attributions groupées par champ.
+def _safe_sheet_title(nom_complet_champ: str) -> str:
+    """Retourne un titre de feuille valide pour Excel (31 caractères au maximum)."""
+    return nom_complet_champ.translate(_SHEET_TITLE_TABLE).strip()[:31]
 
-    Returns:
-        Un objet io.BytesIO contenant le fichier Excel (.xlsx) en mémoire.
-    """
-    workbook = openpyxl.Workbook()
-    workbook.remove(cast(Worksheet, workbook.active))
 
-    header_font = Font(bold=True, color="FFFFFF", name="Calibri", size=11)
-    header_fill = PatternFill("solid", fgColor="4F81BD")
-    header_align = Alignment(horizontal="center", vertical="center")
+def _set_column_widths(sheet: WriteOnlyWorksheet, widths: tuple[tuple[str, float], ...]) -> None:
+    """Fixe la largeur des colonnes en créant directement leurs dimensions."""
+    column_dimensions = sheet.column_dimensions
+    for col_letter, width in widths:
+        column_dimensions[col_letter] = ColumnDimension(sheet, index=col_letter, width=width)
 
-    cell_font = Font(name="Calibri", size=11)
-    center_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    left_align = Alignment(horizontal="left", vertical="center", wrap_text=True)
-    right_align = Alignment(horizontal="right", vertical="center")
-    number_format_periods = "General"
 
-    subtotal_font = Font(bold=True, name="Calibri", size=11)
-    subtotal_fill = PatternFill("solid", fgColor="F2F2F2")
+def _merge_row(sheet: WriteOnlyWorksheet, row: int, start_col: int, end_col: int) -> None:
+    """
+    Fusionne les cellules d'une ligne entre deux colonnes.
 
-    grand_total_font = Font(bold=True, color="FFFFFF", name="Calibri", size=11)
-    grand_total_fill = PatternFill("solid", fgColor="365F91")
+    La plage est ajoutée directement aux fusions de la feuille, sans la validation
+    de `merge_cells` : les lignes de total fusionnées ne se chevauchent jamais.
+    """
+    sheet.merged_cells.ranges.add(CellRange(min_col=start_col, min_row=row, max_col=end_col, max_row=row))
 
-    for champ_no, champ_data in attributions_par_champ.items():
-        champ_nom = champ_data["nom"]
-        attributions = champ_data["attributions"]
-        nom_complet_champ = f"{champ_no}-{champ_nom}"
-        safe_sheet_title = "".join(c for c in nom_complet_champ if c.isalnum() or c in " -_").strip()[:31]
-        sheet: Worksheet = workbook.create_sheet(title=safe_sheet_title)
-
-        current_row_num = 2
-        headers = [
-            "Enseignant",
-            "Code cours",
-            "Description",
-            "Cours autre",
-            "Nb. grp.",
-            "Pér./ groupe",
-            "Pér. Total",
-        ]
-        for col_idx, header_text in enumerate(headers, start=2):
-            cell = sheet.cell(row=current_row_num, column=col_idx, value=header_text)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_align
-        current_row_num += 1
-
-        grand_total_periodes_champ = 0.0
-        subtotal_periodes_enseignant = 0.0
-        previous_teacher_name = None
-        previous_teacher_fullname = None
-        group_start_row = current_row_num
-
-        for attr in attributions:
-            nom_enseignant_cle = f"{attr['nom']}, {attr['prenom']}"
-            nom_enseignant_affichage = f"{attr['prenom']} {attr['nom']}"
-
-            if previous_teacher_name is not None and nom_enseignant_cle != previous_teacher_name:
-                sheet.cell(
-                    row=current_row_num,
-                    column=2,
-                    value=f"Total pour {previous_teacher_fullname} ",
-                )
-                cell_value = sheet.cell(row=current_row_num, column=8)
-                cell_value.value = subtotal_periodes_enseignant
-                sheet.merge_cells(
-                    start_row=current_row_num,
-                    start_column=2,
-                    end_row=current_row_num,
-                    end_column=7,
-                )
-                for col_idx in range(2, 9):
-                    cell = sheet.cell(row=current_row_num, column=col_idx)
-                    cell.font = subtotal_font
-                    cell.fill = subtotal_fill
-                    if col_idx == 2:
-                        cell.alignment = right_align
-                    elif col_idx == 8:
-                        cell.alignment = center_align
-                        cell.number_format = number_format_periods
-                _apply_border_to_range(sheet, group_start_row, current_row_num, 2, 8)
-                current_row_num += 2
-                group_start_row = current_row_num
-                subtotal_periodes_enseignant = 0.0
-
-            est_autre = "Oui" if attr["estcoursautre"] else "Non"
-            nb_groupes = attr["total_groupes_pris"]
-            per_groupe = float(attr["nbperiodes"])
-            per_total_ligne = int(nb_groupes) * per_groupe
-
-            row_data: list[Any] = [
-                f"{attr['nom']}, {attr['prenom']}",
-                attr["codecours"],
-                attr["coursdescriptif"],
-                est_autre,
-                nb_groupes,
-                per_groupe,
-                per_total_ligne,
-            ]
-            for col_idx, cell_value in enumerate(row_data, start=2):
-                cell = sheet.cell(row=current_row_num, column=col_idx, value=cell_value)
-                cell.font = cell_font
-                if col_idx in {2, 3, 4}:
-                    cell.alignment = left_align
-                else:
-                    cell.alignment = center_align
-                if col_idx in {6, 7, 8}:
-                    cell.number_format = number_format_periods
-            current_row_num += 1
 
-            subtotal_periodes_enseignant += per_total_ligne
-            grand_total_periodes_champ += per_total_ligne
-            previous_teacher_name = nom_enseignant_cle
-            previous_teacher_fullname = nom_enseignant_affichage
+def _save_workbook(workbook: openpyxl.Workbook) -> SpooledTemporaryFile[bytes]:
+    """
+    Enregistre le classeur dans un fichier temporaire prêt à être lu depuis le début.
 
-        if previous_teacher_name is not None:
-            sheet.cell(
-                row=current_row_num,
-                column=2,
-                value=f"Total pour {previous_teacher_fullname} ",
-            )
-            cell_value = sheet.cell(row=current_row_num, column=8)
-            cell_value.value = subtotal_periodes_enseignant
-
-            sheet.merge_cells(
-                start_row=current_row_num,
-                start_column=2,
-                end_row=current_row_num,
-                end_column=7,
-            )
-            for col_idx in range(2, 9):
-                cell = sheet.cell(row=current_row_num, column=col_idx)
-                cell.font = subtotal_font
-                cell.fill = subtotal_fill
-                if col_idx == 2:
-                    cell.alignment = right_align
-                elif col_idx == 8:
-                    cell.alignment = center_align
-                    cell.number_format = number_format_periods
-            _apply_border_to_range(sheet, group_start_row, current_row_num, 2, 8)
-            current_row_num += 2
-
-            sheet.cell(
-                row=current_row_num,
-                column=2,
-                value="TOTAL DES PÉRIODES ATTRIBUÉES DU CHAMP",
-            )
-            cell_grand_total_value = sheet.cell(row=current_row_num, column=8)
-            cell_grand_total_value.value = grand_total_periodes_champ
-
-            sheet.merge_cells(
-                start_row=current_row_num,
-                start_column=2,
-                end_row=current_row_num,
-                end_column=7,
-            )
-            for col_idx in range(2, 9):
-                cell = sheet.cell(row=current_row_num, column=col_idx)
-                cell.font = grand_total_font
-                cell.fill = grand_total_fill
-                if col_idx == 2:
-                    cell.alignment = right_align
-                elif col_idx == 8:
-                    cell.alignment = center_align
-                    cell.number_format = number_format_periods
-
-        column_widths = {
-            "A": 3,
-            "B": 30,
-            "C": 11,
-            "D": 43,
-            "E": 12,
-            "F": 10,
-            "G": 12,
-            "H": 12,
-        }
-        for col_letter, width in column_widths.items():
-            sheet.column_dimensions[col_letter].width = width
-        sheet.freeze_panes = "B3"
-
-    mem_file = io.BytesIO()
+    Le fichier reste en mémoire jusqu'à `_SPOOL_MAX_SIZE` octets et bascule ensuite
+    sur le disque, ce qui borne la mémoire consommée par les gros exports.
+    """
+    mem_file: SpooledTemporaryFile[bytes] = SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE, mode="w+b")
     workbook.save(mem_file)
     mem_file.seek(0)
     return mem_file
 
 
-def generer_export_periodes_restantes(periodes_par_champ: dict[str, dict[str, Any]]) -> io.BytesIO:
+def _new_write_only_workbook(style_names: tuple[str, ...]) -> openpyxl.Workbook:
     """
-    Génère un fichier Excel des périodes restantes avec totaux et mise en forme.
+    Crée un classeur en écriture seule pour un export.
+
+    Seuls les styles nommés utilisés par l'export y sont enregistrés, car Excel les
+    affiche dans la galerie des styles de cellule. Les objets NamedStyle sont liés à
+    un classeur, ils sont donc recréés pour chaque export à partir des définitions
+    partagées du module.
+    """
+    workbook = openpyxl.Workbook(write_only=True)
+    for name in style_names:
+        workbook.add_named_style(NamedStyle(name=name, **_NAMED_STYLES[name]))
+    return workbook
+
+
+def _named_style_arrays(workbook: openpyxl.Workbook) -> dict[str, StyleArray]:
+    """
+    Retourne, pour chaque style nommé du classeur, le tableau d'indices de style
+    qu'openpyxl associe à une cellule portant ce style.
+
+    Assigner `cell.style = nom` recherche le style par son nom dans la liste du
+    classeur à chaque cellule ; les tableaux sont donc résolus une fois par feuille.
+    """
+    return {style.name: style.as_tuple() for style in workbook._named_styles}
+
+
+def _styled_cell(sheet: WriteOnlyWorksheet, value: Any, style_array: StyleArray) -> Cell:
+    """Crée une cellule en écriture seule portant le style nommé résolu en `style_array`."""
+    cell = WriteOnlyCell(sheet, value=value)
+    cell._style = copy(style_array)
+    return cell
+
+
+def _total_row(
+    sheet: WriteOnlyWorksheet,
+    label: str,
+    value: float,
+    value_col: int,
+    label_style: StyleArray,
+    filler_style: StyleArray,
+    value_style: StyleArray,
+) -> list[Cell | None]:
+    """
+    Construit une ligne de total : libellé en colonne B, cellules de remplissage
+    jusqu'à la colonne de la valeur, puis la valeur.
+    """
+    return [
+        None,
+        _styled_cell(sheet, label, label_style),
+        *(_styled_cell(sheet, None, filler_style) for _ in range(3, value_col)),
+        _styled_cell(sheet, value, value_style),
+    ]
+
+
+def _write_grouped_sheet(
+    workbook: openpyxl.Workbook,
+    sheet_title: str,
+    headers: tuple[str, ...],
+    column_widths: tuple[tuple[str, float], ...],
+    row_style_names: tuple[str, ...],
+    groups: Iterable[tuple[str, Iterable[list[Any]]]],
+    grand_total_label: str,
+) -> None:
+    """
+    Ajoute au classeur en écriture seule une feuille de lignes groupées avec totaux.
+
+    Les en-têtes sont écrits en ligne 2 à partir de la colonne B. Chaque groupe est
+    suivi d'une ligne de sous-total fusionnée, puis d'une ligne vide ; le total de la
+    feuille termine le tout. La dernière valeur de chaque ligne est celle qui est
+    additionnée.
 
     Args:
-        periodes_par_champ: Dictionnaire des périodes restantes par champ.
+        groups: Couples (libellé du sous-total, lignes du groupe), dans l'ordre
+            d'écriture. Les lignes d'un groupe sont consommées avant le groupe suivant.
+    """
+    sheet = cast(WriteOnlyWorksheet, workbook.create_sheet(title=sheet_title))
+    # En écriture seule, les largeurs et le volet figé doivent précéder la première ligne.
+    _set_column_widths(sheet, column_widths)
+    sheet.freeze_panes = "B3"
+    styles = _named_style_arrays(workbook)
+    row_styles = tuple(styles[name] for name in row_style_names)
+    value_col = len(headers) + 1
+    append_row = sheet.append
+
+    append_row([])
+    append_row([None, *(_styled_cell(sheet, header_text, styles[_STYLE_HEADER]) for header_text in headers)])
+    current_row_num = 3
+
+    # Les totaux par ligne sont conservés dans des tableaux de doubles, réduits par math.fsum.
+    totaux_lignes_feuille = array("d")
+
+    for subtotal_label, rows in groups:
+        totaux_lignes_groupe = array("d")
+        for row_data in rows:
+            append_row([None, *(_styled_cell(sheet, value, style) for value, style in zip(row_data, row_styles))])
+            current_row_num += 1
+            totaux_lignes_groupe.append(row_data[-1])
+
+        totaux_lignes_feuille.extend(totaux_lignes_groupe)
+        append_row(
+            _total_row(
+                sheet,
+                subtotal_label,
+                math.fsum(totaux_lignes_groupe),
+                value_col,
+                styles[_STYLE_SUBTOTAL_LABEL],
+                styles[_STYLE_SUBTOTAL],
+                styles[_STYLE_SUBTOTAL_VALUE],
+            )
+        )
+        _merge_row(sheet, current_row_num, 2, value_col - 1)
+        append_row([])
+        current_row_num += 2
+
+    if totaux_lignes_feuille:
+        append_row(
+            _total_row(
+                sheet,
+                grand_total_label,
+                math.fsum(totaux_lignes_feuille),
+                value_col,
+                styles[_STYLE_GRAND_TOTAL_LABEL],
+                styles[_STYLE_GRAND_TOTAL],
+                styles[_STYLE_GRAND_TOTAL_VALUE],
+            )
+        )
+        _merge_row(sheet, current_row_num, 2, value_col - 1)
 
-    Returns:
-        Un objet io.BytesIO contenant le fichier Excel (.xlsx) en mémoire.
+
+def _group_in_order(rows: list[dict[str, Any]], key: Callable[[dict[str, Any]], Any]) -> dict[Any, list[dict[str, Any]]]:
+    """
+    Regroupe les lignes par clé, dans l'ordre de première apparition.
+
+    Les clés ne sont jamais comparées entre elles : l'ordre (collation) fourni par la
+    base de données est conservé et les valeurs NULL (`None`) sont acceptées.
     """
-    workbook = openpyxl.Workbook()
-    workbook.remove(cast(Worksheet, workbook.active))
+    groups: dict[Any, list[dict[str, Any]]] = {}
+    for row in rows:
+        groups.setdefault(key(row), []).append(row)
+    return groups
+
+
+def _taches_rows(nom_enseignant_cle: str, attributions_enseignant: Iterable[dict[str, Any]]) -> Iterator[list[Any]]:
+    """Produit les lignes de données des attributions d'un enseignant."""
+    for attr in attributions_enseignant:
+        # Le service d'export fournit déjà `nbperiodes` en float et le nombre de groupes en entier.
+        codecours, coursdescriptif, estcoursautre, nb_groupes, per_groupe = _TACHES_ROW_FIELDS(attr)
+        yield [
+            nom_enseignant_cle,
+            codecours,
+            coursdescriptif,
+            _OUI_NON[bool(estcoursautre)],
+            nb_groupes,
+            per_groupe,
+            nb_groupes * per_groupe,
+        ]
 
-    header_font = Font(bold=True, color="FFFFFF", name="Calibri", size=11)
-    header_fill = PatternFill("solid", fgColor="4F81BD")
-    header_align = Alignment(horizontal="center", vertical="center")
-    cell_font = Font(name="Calibri", size=11)
-    left_align = Alignment(horizontal="left", vertical="center", wrap_text=True)
-    right_align = Alignment(horizontal="right", vertical="center")
-    center_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-    number_format_periods = "General"
 
-    subtotal_font = Font(bold=True, name="Calibri", size=11)
-    subtotal_fill = PatternFill("solid", fgColor="F2F2F2")
+def _taches_groups(attributions: list[dict[str, Any]]) -> Iterator[tuple[str, Iterator[list[Any]]]]:
+    """Regroupe les attributions par enseignant, avec le libellé de leur sous-total."""
+    for (nom, prenom), attributions_enseignant in _group_in_order(attributions, itemgetter("nom", "prenom")).items():
+        yield f"Total pour {prenom} {nom} ", _taches_rows(f"{nom}, {prenom}", attributions_enseignant)
 
-    grand_total_font = Font(bold=True, color="FFFFFF", name="Calibri", size=11)
-    grand_total_fill = PatternFill("solid", fgColor="365F91")
 
-    for champ_no, champ_data in periodes_par_champ.items():
-        champ_nom = champ_data["nom"]
-        periodes = champ_data["periodes"]
-        nom_complet_champ = f"{champ_no}-{champ_nom}"
-        safe_sheet_title = "".join(c for c in nom_complet_champ if c.isalnum() or c in " -_").strip()[:31]
-        sheet: Worksheet = workbook.create_sheet(title=safe_sheet_title)
-
-        current_row_num = 2
-        headers = [
-            "Champ",
-            "Tâche restantes",
-            "Code cours",
-            "Description",
-            "Cours autre",
-            "Pér./ groupe",
+def _write_taches_sheet(workbook: openpyxl.Workbook, sheet_title: str, attributions: list[dict[str, Any]]) -> None:
+    """Ajoute au classeur en écriture seule la feuille des tâches attribuées d'un champ."""
+    _write_grouped_sheet(
+        workbook,
+        sheet_title,
+        _TACHES_HEADERS,
+        _TACHES_COLUMN_WIDTHS,
+        _TACHES_ROW_STYLES,
+        _taches_groups(attributions),
+        "TOTAL DES PÉRIODES ATTRIBUÉES DU CHAMP",
+    )
+
+
+def _periodes_rows(nom_complet_champ: str, tache_display: str, periodes_tache: Iterable[dict[str, Any]]) -> Iterator[list[Any]]:
+    """Produit les lignes de données des périodes restantes d'une tâche."""
+    for periode in periodes_tache:
+        # Comme pour les tâches, le service d'export convertit déjà `nbperiodes` en float.
+        codecours, coursdescriptif, estcoursautre, nbperiodes = _PERIODES_ROW_FIELDS(periode)
+        yield [
+            nom_complet_champ,
+            tache_display,
+            codecours,
+            coursdescriptif,
+            _OUI_NON[bool(estcoursautre)],
+            nbperiodes,
         ]
-        for col_idx, header_text in enumerate(headers, start=2):
-            cell = sheet.cell(row=current_row_num, column=col_idx, value=header_text)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_align
-        current_row_num += 1
-
-        grand_total_periodes = 0.0
-        subtotal_periodes = 0.0
-        previous_tache_raw = None
-        previous_tache_display = None
-        group_start_row = current_row_num
-
-        for periode in periodes:
-            current_tache_raw = periode["tache_restante"]
-            prefix_champ = f"{champ_no}-"
-            current_tache_display = current_tache_raw
-            if current_tache_raw.startswith(prefix_champ):
-                current_tache_display = current_tache_raw.removeprefix(prefix_champ)
-
-            if previous_tache_raw is not None and current_tache_raw != previous_tache_raw:
-                sheet.cell(
-                    row=current_row_num,
-                    column=2,
-                    value=f"Total pour {previous_tache_display} ",
-                )
-                cell_value = sheet.cell(row=current_row_num, column=7)
-                cell_value.value = subtotal_periodes
-                sheet.merge_cells(
-                    start_row=current_row_num,
-                    start_column=2,
-                    end_row=current_row_num,
-                    end_column=6,
-                )
-                for col_idx in range(2, 8):
-                    cell = sheet.cell(row=current_row_num, column=col_idx)
-                    cell.font = subtotal_font
-                    cell.fill = subtotal_fill
-                    if col_idx == 2:
-                        cell.alignment = right_align
-                    elif col_idx == 7:
-                        cell.alignment = center_align
-                        cell.number_format = number_format_periods
-                _apply_border_to_range(sheet, group_start_row, current_row_num, 2, 7)
-                current_row_num += 2
-                group_start_row = current_row_num
-                subtotal_periodes = 0.0
-
-            est_autre = "Oui" if periode["estcoursautre"] else "Non"
-            current_periods_val = float(periode["nbperiodes"])
-            row_data: list[Any] = [
-                nom_complet_champ,
-                current_tache_display,
-                periode["codecours"],
-                periode["coursdescriptif"],
-                est_autre,
-                current_periods_val,
+
+
+def _periodes_groups(champ_no: str, nom_complet_champ: str, periodes: list[dict[str, Any]]) -> Iterator[tuple[str, Iterator[list[Any]]]]:
+    """Regroupe les périodes restantes par tâche, avec le libellé de leur sous-total."""
+    prefix_champ = f"{champ_no}-"
+    for tache_raw, periodes_tache in _group_in_order(periodes, itemgetter("tache_restante")).items():
+        tache_display = tache_raw.removeprefix(prefix_champ)
+        yield f"Total pour {tache_display} ", _periodes_rows(nom_complet_champ, tache_display, periodes_tache)
+
+
+def _write_periodes_sheet(
+    workbook: openpyxl.Workbook,
+    sheet_title: str,
+    champ_no: str,
+    nom_complet_champ: str,
+    periodes: list[dict[str, Any]],
+) -> None:
+    """Ajoute au classeur en écriture seule la feuille des périodes restantes d'un champ."""
+    _write_grouped_sheet(
+        workbook,
+        sheet_title,
+        _PERIODES_HEADERS,
+        _PERIODES_COLUMN_WIDTHS,
+        _PERIODES_ROW_STYLES,
+        _periodes_groups(champ_no, nom_complet_champ, periodes),
+        "TOTAL DES PÉRIODES RESTANTES DU CHAMP",
+    )
+
+
+def _write_org_scolaire_sheet(workbook: openpyxl.Workbook, sheet_title: str, donnees: list[dict[str, Any]]) -> None:
+    """Ajoute au classeur en écriture seule la feuille de l'organisation scolaire d'un champ."""
+    sheet = cast(WriteOnlyWorksheet, workbook.create_sheet(title=sheet_title))
+    # En écriture seule, les largeurs doivent précéder la première ligne.
+    _set_column_widths(sheet, _ORG_COLUMN_WIDTHS)
+    styles = _named_style_arrays(workbook)
+    header_style = styles[_STYLE_ORG_HEADER]
+    total_style = styles[_STYLE_ORG_TOTAL]
+    append_row = sheet.append
+
+    append_row([_styled_cell(sheet, header_text, header_style) for header_text in _ORG_HEADERS])
+
+    # Valeurs de périodes de chaque ligne, alignées sur _ORG_PERIOD_HEADERS.
+    period_rows: list[list[float]] = []
+
+    for item in donnees:
+        nom_affiche = item["nomcomplet"] if item["estfictif"] else f"{item['nom']}, {item['prenom']}"
+        period_values = [item.get(header, 0.0) for header in _ORG_PERIOD_HEADERS]
+        period_rows.append(period_values)
+        append_row([nom_affiche, *period_values])
+
+    if donnees:
+        totals = [math.fsum(column) for column in zip(*period_rows)]
+        append_row([_styled_cell(sheet, value, total_style) for value in ("TOTAL", *totals)])
+        append_row([])
+        append_row(
+            [
+                _styled_cell(sheet, "TOTAL PÉRIODES DU CHAMP", total_style),
+                _styled_cell(sheet, math.fsum(totals), total_style),
             ]
-            for col_idx, cell_value in enumerate(row_data, start=2):
-                cell = sheet.cell(row=current_row_num, column=col_idx, value=cell_value)
-                cell.font = cell_font
-                if col_idx in {2, 3, 4, 5}:
-                    cell.alignment = left_align
-                else:
-                    cell.alignment = center_align
-                if col_idx == 7:
-                    cell.number_format = number_format_periods
-            current_row_num += 1
+        )
 
-            subtotal_periodes += current_periods_val
-            grand_total_periodes += current_periods_val
-            previous_tache_raw = current_tache_raw
-            previous_tache_display = current_tache_display
 
-        if previous_tache_raw is not None:
-            sheet.cell(
-                row=current_row_num,
-                column=2,
-                value=f"Total pour {previous_tache_display} ",
-            )
-            cell_value = sheet.cell(row=current_row_num, column=7)
-            cell_value.value = subtotal_periodes
-            sheet.merge_cells(
-                start_row=current_row_num,
-                start_column=2,
-                end_row=current_row_num,
-                end_column=6,
-            )
-            for col_idx in range(2, 8):
-                cell = sheet.cell(row=current_row_num, column=col_idx)
-                cell.font = subtotal_font
-                cell.fill = subtotal_fill
-                if col_idx == 2:
-                    cell.alignment = right_align
-                elif col_idx == 7:
-                    cell.alignment = center_align
-                    cell.number_format = number_format_periods
-            _apply_border_to_range(sheet, group_start_row, current_row_num, 2, 7)
-            current_row_num += 2
-
-            sheet.cell(
-                row=current_row_num,
-                column=2,
-                value="TOTAL DES PÉRIODES RESTANTES DU CHAMP",
-            )
-            cell_grand_total_value = sheet.cell(row=current_row_num, column=7)
-            cell_grand_total_value.value = grand_total_periodes
-            sheet.merge_cells(
-                start_row=current_row_num,
-                start_column=2,
-                end_row=current_row_num,
-                end_column=6,
-            )
-            for col_idx in range(2, 8):
-                cell = sheet.cell(row=current_row_num, column=col_idx)
-                cell.font = grand_total_font
-                cell.fill = grand_total_fill
-                if col_idx == 2:
-                    cell.alignment = right_align
-                elif col_idx == 7:
-                    cell.alignment = center_align
-                    cell.number_format = number_format_periods
-
-        column_widths = {
-            "A": 3,
-            "B": 35,
-            "C": 16,
-            "D": 11,
-            "E": 43,
-            "F": 12,
-            "G": 12,
-        }
-        for col_letter, width in column_widths.items():
-            sheet.column_dimensions[col_letter].width = width
-        sheet.freeze_panes = "B3"
-
-    mem_file = io.BytesIO()
-    workbook.save(mem_file)
-    mem_file.seek(0)
-    return mem_file
+def generer_export_taches(attributions_par_champ: dict[str, dict[str, Any]]) -> SpooledTemporaryFile[bytes]:
+    """
+    Génère un fichier Excel des tâches attribuées, avec une feuille par champ.
 
+    Args:
+        attributions_par_champ: Dictionnaire des attributions groupées par champ.
+            Les attributions de chaque champ sont regroupées par enseignant.
 
-def generer_export_org_scolaire(donnees_par_champ: dict[str, dict[str, Any]]) -> io.BytesIO:
+    Returns:
+        Un fichier temporaire contenant le fichier Excel (.xlsx), positionné au début.
+    """
+    workbook = _new_write_only_workbook(_GROUPED_SHEET_STYLES)
+
+    for champ_no, champ_data in attributions_par_champ.items():
+        # Un champ sans attribution ne produit pas de feuille.
+        if not champ_data["attributions"]:
+            continue
+        nom_complet_champ = f"{champ_no}-{champ_data['nom']}"
+        _write_taches_sheet(workbook, _safe_sheet_title(nom_complet_champ), champ_data["attributions"])
+
+    return _save_workbook(workbook)
+
+
+def generer_export_periodes_restantes(periodes_par_champ: dict[str, dict[str, Any]]) -> SpooledTemporaryFile[bytes]:
+    """
+    Génère un fichier Excel des périodes restantes avec totaux et mise en forme.
+
+    Args:
+        periodes_par_champ: Dictionnaire des périodes restantes par champ.
+            Les périodes de chaque champ sont regroupées par tâche restante.
+
+    Returns:
+        Un fichier temporaire contenant le fichier Excel (.xlsx), positionné au début.
+    """
+    workbook = _new_write_only_workbook(_GROUPED_SHEET_STYLES)
+
+    for champ_no, champ_data in periodes_par_champ.items():
+        # Un champ sans période restante ne produit pas de feuille.
+        if not champ_data["periodes"]:
+            continue
+        nom_complet_champ = f"{champ_no}-{champ_data['nom']}"
+        _write_periodes_sheet(workbook, _safe_sheet_title(nom_complet_champ), champ_no, nom_complet_champ, champ_data["periodes"])
+
+    return _save_workbook(workbook)
+
+
+def generer_export_org_scolaire(donnees_par_champ: dict[str, dict[str, Any]]) -> SpooledTemporaryFile[bytes]:
     """
     Génère un fichier Excel pour l'organisation scolaire.
 
@@ -417,92 +508,12 @@ def generer_export_org_scolaire(donnees_par_champ: dict[str, dict[str, Any]]) ->
         donnees_par_champ: Dictionnaire des données pivotées groupées par champ.
 
     Returns:
-        Un objet io.BytesIO contenant le fichier Excel (.xlsx) en mémoire.
+        Un fichier temporaire contenant le fichier Excel (.xlsx), positionné au début.
     """
-    workbook = openpyxl.Workbook()
-    workbook.remove(cast(Worksheet, workbook.active))
-
-    total_font = Font(bold=True, name="Calibri", size=11)
-    header_font_org = Font(bold=True, name="Calibri", size=11)
-    header_align = Alignment(wrap_text=True, horizontal="center", vertical="center")
-
-    HEADERS = [
-        "NOM, PRÉNOM",
-        "PÉRIODES RÉGULIER",
-        "PÉRIODES ADAPTATION SCOLAIRE",
-        "PÉRIODES SPORT-ÉTUDES",
-        "PÉRIODES ENSEIGNANT RESSOURCE",
-        "PÉRIODES AIDESEC",
-        "PÉRIODES DIPLÔMA",
-        "PÉRIODES MESURE SEUIL (UTILISÉE COORDINATION PP)",
-        "PÉRIODES MESURE SEUIL (RESSOURCES AUTRES)",
-        "PÉRIODES MESURE SEUIL (POUR FABLAB)",
-        "PÉRIODES MESURE SEUIL (BONIFIER ALTERNE)",
-        "PÉRIODES ALTERNE",
-        "PÉRIODES FORMANUM",
-        "PÉRIODES MENTORAT",
-        "PÉRIODES COORDINATION SPORT-ÉTUDES",
-        "PÉRIODES SOUTIEN SPORT-ÉTUDES",
-    ]
-    COLUMN_WIDTH = 22
+    workbook = _new_write_only_workbook(_ORG_SHEET_STYLES)
 
     for champ_no, champ_data in donnees_par_champ.items():
-        champ_nom = champ_data["nom"]
-        donnees = champ_data["donnees"]
-        nom_complet_champ = f"{champ_no}-{champ_nom}"
-        safe_sheet_title = "".join(c for c in nom_complet_champ if c.isalnum() or c in " -_").strip()[:31]
-        sheet: Worksheet = workbook.create_sheet(title=safe_sheet_title)
-
-        for col_idx, header_text in enumerate(HEADERS, start=1):
-            cell = sheet.cell(row=1, column=col_idx, value=header_text)
-            cell.font = header_font_org
-            cell.alignment = header_align
-
-        totals: dict[str, float] = {h: 0.0 for h in HEADERS if h != "NOM, PRÉNOM"}
-
-        for item in donnees:
-            row_data: list[str | float] = []
-            if item["estfictif"]:
-                row_data.append(item["nomcomplet"])
-            else:
-                row_data.append(f"{item['nom']}, {item['prenom']}")
-
-            for header in HEADERS[1:]:
-                period_value = item.get(header, 0.0)
-                row_data.append(period_value)
-                totals[header] += period_value
-            sheet.append(row_data)
-
-        if donnees:
-            total_row_idx = sheet.max_row + 1
-            total_cell = sheet.cell(row=total_row_idx, column=1, value="TOTAL")
-            total_cell.font = total_font
-            for col_idx, header_text in enumerate(HEADERS, start=1):
-                if header_text in totals:
-                    cell = sheet.cell(row=total_row_idx, column=col_idx)
-                    cell.value = totals[header_text]
-                    cell.font = total_font
-
-            grand_total_row_idx = total_row_idx + 2
-            grand_total_periodes_champ = sum(totals.values())
-            label_cell = sheet.cell(
-                row=grand_total_row_idx,
-                column=1,
-                value="TOTAL PÉRIODES DU CHAMP",
-            )
-            label_cell.font = total_font
-            value_cell = sheet.cell(
-                row=grand_total_row_idx,
-                column=2,
-            )
-            value_cell.value = grand_total_periodes_champ
-            value_cell.font = total_font
-
-        for i in range(1, len(HEADERS) + 1):
-            letter = get_column_letter(i)
-            sheet.column_dimensions[letter].width = COLUMN_WIDTH
+        nom_complet_champ = f"{champ_no}-{champ_data['nom']}"
+        _write_org_scolaire_sheet(workbook, _safe_sheet_title(nom_complet_champ), champ_data["donnees"])
 
-    mem_file = io.BytesIO()
-    workbook.save(mem_file)
-    mem_file.seek(0)
-    return mem_file
+    return _save_workbook(workbook)
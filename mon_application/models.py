@@ -51,7 +51,8 @@ class User(db.Model, UserMixin):
         """Vérifie si l'utilisateur a l'autorisation d'accéder à un champ."""
         if self.is_admin or self.is_dashboard_only:
             return True
-        return champ_no in self.allowed_champs
+        # Parcours direct de la relation : s'arrête au premier champ trouvé sans construire de liste.
+        return any(champ.champno == champ_no for champ in self.champs_autorises)
 
 
 class Champ(db.Model):
@@ -0,0 +1,222 @@
+# tests/test_exports.py
+"""
+Tests unitaires pour le module de génération des fichiers Excel.
+Les fonctions d'export sont indépendantes de Flask : on leur fournit des données
+brutes et on relit le classeur produit avec openpyxl pour valider son contenu.
+"""
+
+import openpyxl
+import pytest
+
+from mon_application.exports import (
+    generer_export_org_scolaire,
+    generer_export_periodes_restantes,
+    generer_export_taches,
+)
+
+
+def _attribution(nom, prenom, codecours, nb_groupes, nbperiodes, estcoursautre=False):
+    """Construit une attribution telle que fournie par le service d'export."""
+    return {
+        "nom": nom,
+        "prenom": prenom,
+        "codecours": codecours,
+        "coursdescriptif": f"Description {codecours}",
+        "estcoursautre": estcoursautre,
+        "total_groupes_pris": nb_groupes,
+        "nbperiodes": nbperiodes,
+    }
+
+
+def _periode(tache_restante, codecours, nbperiodes, estcoursautre=False):
+    """Construit une période restante telle qu'attendue par l'export."""
+    return {
+        "tache_restante": tache_restante,
+        "codecours": codecours,
+        "coursdescriptif": f"Description {codecours}",
+        "estcoursautre": estcoursautre,
+        "nbperiodes": nbperiodes,
+    }
+
+
+def _charger(mem_file):
+    """Relit le fichier produit par un export."""
+    return openpyxl.load_workbook(mem_file)
+
+
+def _valeurs_ligne(sheet, row, min_col, max_col):
+    return [sheet.cell(row=row, column=col).value for col in range(min_col, max_col + 1)]
+
+
+class TestExportTaches:
+    """Tests pour `generer_export_taches`."""
+
+    def test_une_feuille_par_champ_avec_sous_totaux(self):
+        """Vérifie les lignes de données, les sous-totaux par enseignant et le total du champ."""
+        donnees = {
+            "MATH": {
+                "nom": "Mathématiques",
+                "attributions": [
+                    _attribution("Curie", "Marie", "M1", 2, 4.0),
+                    _attribution("Curie", "Marie", "M2", 1, 2.5, estcoursautre=True),
+                    _attribution("Euler", "Leonhard", "M3", 3, 1.5),
+                ],
+            },
+            "FRAN": {"nom": "Français", "attributions": [_attribution("Camus", "Albert", "F1", 1, 3.0)]},
+        }
+
+        workbook = _charger(generer_export_taches(donnees))
+
+        assert workbook.sheetnames == ["MATH-Mathématiques", "FRAN-Français"]
+        sheet = workbook["MATH-Mathématiques"]
+        assert _valeurs_ligne(sheet, 2, 2, 8) == ["Enseignant", "Code cours", "Description", "Cours autre", "Nb. grp.", "Pér./ groupe", "Pér. Total"]
+        assert _valeurs_ligne(sheet, 3, 2, 8) == ["Curie, Marie", "M1", "Description M1", "Non", 2, 4.0, 8.0]
+        assert _valeurs_ligne(sheet, 4, 2, 8) == ["Curie, Marie", "M2", "Description M2", "Oui", 1, 2.5, 2.5]
+        assert sheet["B5"].value == "Total pour Marie Curie "
+        assert sheet["H5"].value == pytest.approx(10.5)
+        assert _valeurs_ligne(sheet, 7, 2, 8) == ["Euler, Leonhard", "M3", "Description M3", "Non", 3, 1.5, 4.5]
+        assert sheet["B8"].value == "Total pour Leonhard Euler "
+        assert sheet["H8"].value == pytest.approx(4.5)
+        assert sheet["B10"].value == "TOTAL DES PÉRIODES ATTRIBUÉES DU CHAMP"
+        assert sheet["H10"].value == pytest.approx(15.0)
+        assert {str(plage) for plage in sheet.merged_cells.ranges} == {"B5:G5", "B8:G8", "B10:G10"}
+        assert sheet.freeze_panes == "B3"
+        assert sheet.column_dimensions["D"].width == 43
+
+    def test_styles_des_cellules(self):
+        """Vérifie que les en-têtes, les données et les totaux portent leur style."""
+        donnees = {"MATH": {"nom": "Mathématiques", "attributions": [_attribution("Curie", "Marie", "M1", 2, 4.0)]}}
+
+        workbook = _charger(generer_export_taches(donnees))
+        sheet = workbook["MATH-Mathématiques"]
+
+        assert "export_entete" in workbook.named_styles and "export_org_entete" not in workbook.named_styles
+        assert sheet["B2"].font.bold and sheet["B2"].fill.fgColor.rgb == "004F81BD"
+        assert sheet["B3"].alignment.horizontal == "left" and sheet["B3"].border.left.style == "thin"
+        assert sheet["H3"].alignment.horizontal == "center"
+        assert sheet["B4"].alignment.horizontal == "right" and sheet["H4"].fill.fgColor.rgb == "00F2F2F2"
+        assert sheet["H6"].font.color.rgb == "00FFFFFF" and sheet["H6"].fill.fgColor.rgb == "00365F91"
+
+    def test_titre_de_feuille_nettoye(self):
+        """Vérifie que le titre de la feuille est épuré et tronqué à 31 caractères."""
+        donnees = {"ART": {"nom": "Arts/plastiques: peinture & sculpture", "attributions": [_attribution("Monet", "Claude", "A1", 1, 2.0)]}}
+
+        workbook = _charger(generer_export_taches(donnees))
+
+        assert workbook.sheetnames == ["ART-Artsplastiques peinture  sc"]
+
+    def test_attributions_non_triees_regroupees(self):
+        """Vérifie qu'un enseignant dont les attributions sont dispersées n'a qu'un sous-total."""
+        donnees = {
+            "MATH": {
+                "nom": "Mathématiques",
+                "attributions": [
+                    _attribution("Euler", "Leonhard", "M3", 1, 1.5),
+                    _attribution("Curie", "Marie", "M1", 1, 4.0),
+                    _attribution("Euler", "Leonhard", "M4", 1, 2.0),
+                ],
+            }
+        }
+
+        sheet = _charger(generer_export_taches(donnees))["MATH-Mathématiques"]
+
+        assert _valeurs_ligne(sheet, 3, 2, 3) == ["Euler, Leonhard", "M3"]
+        assert _valeurs_ligne(sheet, 4, 2, 3) == ["Euler, Leonhard", "M4"]
+        assert sheet["B5"].value == "Total pour Leonhard Euler "
+        assert sheet["H5"].value == pytest.approx(3.5)
+        assert sheet["B8"].value == "Total pour Marie Curie "
+
+    def test_ordre_du_service_conserve(self):
+        """Vérifie que l'ordre des enseignants fourni par le service est conservé, prénom NULL compris."""
+        donnees = {
+            "MATH": {
+                "nom": "Mathématiques",
+                "attributions": [
+                    _attribution("Émond", "Luc", "M1", 1, 1.0),
+                    _attribution("Roy", None, "M2", 1, 2.0),
+                    _attribution("Roy", "Luc", "M3", 1, 3.0),
+                ],
+            }
+        }
+
+        sheet = _charger(generer_export_taches(donnees))["MATH-Mathématiques"]
+
+        assert [sheet.cell(row=row, column=2).value for row in (3, 6, 9)] == ["Émond, Luc", "Roy, None", "Roy, Luc"]
+
+    def test_champ_sans_attribution_ignore(self):
+        """Vérifie qu'aucune feuille n'est créée pour un champ sans attribution."""
+        donnees = {
+            "MATH": {"nom": "Mathématiques", "attributions": []},
+            "FRAN": {"nom": "Français", "attributions": [_attribution("Camus", "Albert", "F1", 1, 3.0)]},
+        }
+
+        workbook = _charger(generer_export_taches(donnees))
+
+        assert workbook.sheetnames == ["FRAN-Français"]
+
+
+class TestExportPeriodesRestantes:
+    """Tests pour `generer_export_periodes_restantes`."""
+
+    def test_sous_totaux_par_tache(self):
+        """Vérifie le retrait du préfixe du champ et les totaux par tâche restante."""
+        donnees = {
+            "MATH": {
+                "nom": "Mathématiques",
+                "periodes": [
+                    _periode("MATH-Tâche 1", "M1", 4.0),
+                    _periode("MATH-Tâche 1", "M2", 2.0, estcoursautre=True),
+                    _periode("Tâche 2", "M3", 1.5),
+                ],
+            }
+        }
+
+        workbook = _charger(generer_export_periodes_restantes(donnees))
+
+        sheet = workbook["MATH-Mathématiques"]
+        assert _valeurs_ligne(sheet, 2, 2, 7) == ["Champ", "Tâche restantes", "Code cours", "Description", "Cours autre", "Pér./ groupe"]
+        assert _valeurs_ligne(sheet, 3, 2, 7) == ["MATH-Mathématiques", "Tâche 1", "M1", "Description M1", "Non", 4.0]
+        assert _valeurs_ligne(sheet, 4, 2, 7) == ["MATH-Mathématiques", "Tâche 1", "M2", "Description M2", "Oui", 2.0]
+        assert sheet["B5"].value == "Total pour Tâche 1 "
+        assert sheet["G5"].value == pytest.approx(6.0)
+        assert _valeurs_ligne(sheet, 7, 2, 7) == ["MATH-Mathématiques", "Tâche 2", "M3", "Description M3", "Non", 1.5]
+        assert sheet["B8"].value == "Total pour Tâche 2 "
+        assert sheet["G8"].value == pytest.approx(1.5)
+        assert sheet["B10"].value == "TOTAL DES PÉRIODES RESTANTES DU CHAMP"
+        assert sheet["G10"].value == pytest.approx(7.5)
+
+
+class TestExportOrgScolaire:
+    """Tests pour `generer_export_org_scolaire`."""
+
+    def test_lignes_et_totaux(self):
+        """Vérifie les noms affichés, les colonnes de périodes et les totaux du champ."""
+        donnees = {
+            "MATH": {
+                "nom": "Mathématiques",
+                "donnees": [
+                    {"nom": "Curie", "prenom": "Marie", "nomcomplet": "Marie Curie", "estfictif": False, "PÉRIODES RÉGULIER": 20.0, "PÉRIODES ALTERNE": 2.0},
+                    {"nom": None, "prenom": None, "nomcomplet": "Tâche 1", "estfictif": True, "PÉRIODES RÉGULIER": 4.5},
+                ],
+            }
+        }
+
+        workbook = _charger(generer_export_org_scolaire(donnees))
+
+        sheet = workbook["MATH-Mathématiques"]
+        assert sheet["A1"].value == "NOM, PRÉNOM"
+        assert sheet["L1"].value == "PÉRIODES ALTERNE"
+        assert sheet["A2"].value == "Curie, Marie"
+        assert sheet["B2"].value == pytest.approx(20.0)
+        assert sheet["C2"].value == pytest.approx(0.0)
+        assert sheet["L2"].value == pytest.approx(2.0)
+        assert sheet["A3"].value == "Tâche 1"
+        assert sheet["A4"].value == "TOTAL"
+        assert sheet["B4"].value == pytest.approx(24.5)
+        assert sheet["L4"].value == pytest.approx(2.0)
+        assert sheet["A6"].value == "TOTAL PÉRIODES DU CHAMP"
+        assert sheet["B6"].value == pytest.approx(26.5)
+        assert sheet["A1"].font.bold and sheet["A1"].alignment.wrap_text
+        assert sheet["A4"].font.bold and sheet["L4"].font.bold and sheet["B6"].font.bold
+        assert sheet.column_dimensions["P"].width == 22
+        assert "export_org_entete" in workbook.named_styles and "export_entete" not in workbook.named_styles